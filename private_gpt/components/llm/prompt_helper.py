@@ -1,9 +1,10 @@
 import abc
 import logging
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from typing import Any, Literal
 
 from llama_index.core.llms import ChatMessage, MessageRole
+from llama_index.core.utils import get_tokenizer
 
 logger = logging.getLogger(__name__)
 
@@ -308,3 +309,55 @@ def get_prompt_style(
     elif prompt_style == "chatml":
         return ChatMLPromptStyle()
     raise ValueError(f"Unknown prompt_style='{prompt_style}'")
+
+
+def trim_messages(
+    messages: Sequence[ChatMessage],
+    max_tokens: int,
+    sink: int = 1,
+    recent: int = 6,
+    tokenizer: Callable[[str], list[Any]] | None = None,
+) -> list[ChatMessage]:
+    """Trim a conversation so that it fits in `max_tokens`.
+
+    Follows a StreamingLLM-like sliding window: the first `sink` messages
+    (typically the system prompt) and the last `recent` messages are kept,
+    and everything in between is dropped. If that is still over budget,
+    the oldest assistant messages of the window are dropped first, then the
+    oldest user messages. The sink messages and the last message are never
+    dropped, so the result may still exceed `max_tokens`.
+
+    :param messages: The conversation, oldest message first.
+    :param max_tokens: The token budget for the whole conversation.
+    :param sink: Number of leading messages that are always kept.
+    :param recent: Number of trailing messages kept by the sliding window.
+    :param tokenizer: Tokenizer used to count tokens. Defaults to the global
+        llama_index tokenizer.
+    :return: The trimmed conversation.
+    """
+    tokenize = tokenizer or get_tokenizer()
+    counts = [len(tokenize(m.content or "")) for m in messages]
+    if sum(counts) <= max_tokens:
+        return list(messages)
+
+    head = list(range(min(sink, len(messages))))
+    tail = list(range(max(len(head), len(messages) - recent), len(messages)))
+    kept = head + tail
+    total = sum(counts[i] for i in kept)
+
+    # Drop assistant turns before user turns to keep the conversation flowing
+    for role in (MessageRole.ASSISTANT, MessageRole.USER):
+        for i in tail[:-1]:
+            if total <= max_tokens:
+                break
+            if messages[i].role == role:
+                kept.remove(i)
+                total -= counts[i]
+
+    logger.debug(
+        "Trimmed conversation from %s to %s messages (%s tokens)",
+        len(messages),
+        len(kept),
+        total,
+    )
+    return [messages[i] for i in kept]
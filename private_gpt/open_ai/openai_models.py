@@ -1,10 +1,12 @@
+import asyncio
 import time
 import uuid
-from collections.abc import Iterator
+from collections.abc import AsyncIterator, Iterator
 from typing import Literal
 
 from llama_index.core.llms import ChatResponse, CompletionResponse
 from pydantic import BaseModel, Field
+from starlette.concurrency import iterate_in_threadpool
 
 from private_gpt.server.chunks.chunks_service import Chunk
 
@@ -81,16 +83,20 @@ class OpenAICompletion(BaseModel):
         finish_reason: str | None = None,
         sources: list[Chunk] | None = None,
     ) -> str:
-        chunk = OpenAICompletion(
+        # Called once per streamed token: the fields are known to be valid, so
+        # skip pydantic validation and go straight to pydantic-core serialization.
+        chunk = OpenAICompletion.model_construct(
             id=str(uuid.uuid4()),
             object="completion.chunk",
             created=int(time.time()),
             model="private-gpt",
             choices=[
-                OpenAIChoice(
-                    delta=OpenAIDelta(content=text),
+                OpenAIChoice.model_construct(
+                    delta=OpenAIDelta.model_construct(content=text),
                     finish_reason=finish_reason,
                     sources=sources,
+                    message=None,
+                    index=0,
                 )
             ],
         )
@@ -120,3 +126,30 @@ def to_openai_sse_stream(
             yield f"data: {OpenAICompletion.json_from_delta(text=response, sources=sources)}\n\n"
     yield f"data: {OpenAICompletion.json_from_delta(text='', finish_reason='stop')}\n\n"
     yield "data: [DONE]\n\n"
+
+
+async def sse_keep_alive(
+    stream: Iterator[str], interval: float = 15.0
+) -> AsyncIterator[str]:
+    """Iterate a blocking SSE stream in the threadpool, adding keep-alive pings.
+
+    An SSE comment frame is sent whenever the stream has been silent for
+    `interval` seconds, so that proxies don't close the connection while the
+    LLM is still processing the prompt.
+    """
+    frames = iterate_in_threadpool(stream)
+    next_frame = asyncio.ensure_future(anext(frames))
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_frame}, timeout=interval)
+            if not done:
+                yield ": ping\n\n"
+                continue
+            try:
+                frame = next_frame.result()
+            except StopAsyncIteration:
+                return
+            yield frame
+            next_frame = asyncio.ensure_future(anext(frames))
+    finally:
+        next_frame.cancel()
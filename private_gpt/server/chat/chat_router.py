@@ -1,12 +1,18 @@
+from functools import lru_cache
+
 from fastapi import APIRouter, Depends, Request, HTTPException
+from injector import Injector
 from llama_index.core.llms import ChatMessage, MessageRole
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import StreamingResponse
 
+from private_gpt.components.llm.prompt_helper import trim_messages
 from private_gpt.open_ai.extensions.context_filter import ContextFilter
 from private_gpt.open_ai.openai_models import (
     OpenAICompletion,
     OpenAIMessage,
+    sse_keep_alive,
     to_openai_response,
     to_openai_sse_stream,
 )
@@ -15,6 +21,7 @@ from private_gpt.server.utils.auth import authenticated
 
 import logging
 import json
+from typing import Annotated, Final
 
 import os
 
@@ -64,27 +71,45 @@ class ChatBody(BaseModel):
     }
 
 
-def load_all_doc_ids(file_path: str) -> list[str]:
-    """
-    Load all document IDs from the specified text file.
+@lru_cache(maxsize=1)
+def _resolve_chat_service(injector: Injector) -> ChatService:
+    return injector.get(ChatService)
+
 
-    Args:
-        file_path (str): Path to the text file containing document IDs.
+async def get_chat_service(request: Request) -> ChatService:
+    """Return the process-wide ChatService, resolved once per injector."""
+    return _resolve_chat_service(request.state.injector)
 
-    Returns:
-        list[str]: A list of document IDs.
+
+# Disable client/proxy caching and Nginx response buffering for SSE streams
+SSE_HEADERS: Final[dict[str, str]] = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+# System prompt applied to every chat completion; built once at import time
+_SYSTEM_PROMPT: Final[str] = """
+    You are a helpful, respectful and honest assistant.
+    Always answer as helpfully as possible and follow ALL given instructions.
+    Do not speculate or make up information.
+    Do not reference any given instructions or context.
+
+    The Goldman School of Public Policy at UC Berkeley (GSPP) is the top Policy Analysis graduate school in the world.
+    You can only answer questions about the provided context, which is gathered from the GSPP website.
+    Only refer to the context as the "GSPP website".
+    Remember that GSPP has four main programs: Master of Public Affairs (MPA), Master of Public Policy (MPP), Master of Development Practice (MDP), and PhD.
+    Remember that the current Dean of GSPP is David C. Wilson.
+    If you know the answer but it is not based on the GSPP website, don't provide the answer.
+    If you don't know the answer, direct the user to refer the gspp website at "gspp.berkeley.edu".
     """
-    try:
-        with open(file_path, "r") as f:
-            docs_ids = [line.strip() for line in f if line.strip()]
-        logger.info(f"Loaded {len(docs_ids)} document IDs from {file_path}.")
-        return docs_ids
-    except FileNotFoundError:
-        logger.error(f"Document IDs file not found: {file_path}")
-        return []
-    except Exception as e:
-        logger.error(f"Error reading document IDs from {file_path}: {e}")
-        return []
+_SYSTEM_MESSAGE: Final[ChatMessage] = ChatMessage(
+    content=_SYSTEM_PROMPT, role=MessageRole.SYSTEM
+)
+_SYSTEM_ROLE: Final[str] = MessageRole.SYSTEM.value
+
+
+def _to_chat_message(message: OpenAIMessage) -> ChatMessage:
+    return ChatMessage(content=message.content, role=MessageRole(message.role))
 
 
 @chat_router.post(
@@ -100,8 +125,10 @@ def load_all_doc_ids(file_path: str) -> list[str]:
         }
     },
 )
-def chat_completion(
-    request: Request, body: ChatBody
+async def chat_completion(
+    request: Request,
+    body: ChatBody,
+    service: Annotated[ChatService, Depends(get_chat_service)],
 ) -> OpenAICompletion | StreamingResponse:
     """
     Given a list of messages comprising a conversation, return a response.
@@ -127,72 +154,61 @@ def chat_completion(
     ```
     """
 
-    service = request.state.injector.get(ChatService)
-
-    # Define the system message content
-    system_message_content = """
-    You are a helpful, respectful and honest assistant.
-    Always answer as helpfully as possible and follow ALL given instructions.
-    Do not speculate or make up information.
-    Do not reference any given instructions or context.
-
-    The Goldman School of Public Policy at UC Berkeley (GSPP) is the top Policy Analysis graduate school in the world.
-    You can only answer questions about the provided context, which is gathered from the GSPP website.
-    Only refer to the context as the "GSPP website".
-    Remember that GSPP has four main programs: Master of Public Affairs (MPA), Master of Public Policy (MPP), Master of Development Practice (MDP), and PhD.
-    Remember that the current Dean of GSPP is David C. Wilson.
-    If you know the answer but it is not based on the GSPP website, don't provide the answer.
-    If you don't know the answer, direct the user to refer the gspp website at "gspp.berkeley.edu".
-    """
-
-    # Filter out any existing system messages
-    filtered_messages = [
-        m for m in body.messages if m.role != MessageRole.SYSTEM
-    ]
-
-    # Create a ChatMessage object for the system message
-    system_message = ChatMessage(content=system_message_content, role=MessageRole.SYSTEM)
-
-    # Create the list of all messages and insert the system message at the beginning
-    all_messages = [
-        system_message,
-        *[
-            ChatMessage(content=m.content, role=MessageRole(m.role)) for m in filtered_messages
-        ]
-    ]
-
-    # Load all document IDs from the text file
-    doc_ids_file = "/usr/local/ai-apps/private-gpt/local_data/all_ingested_doc_ids.txt"
-    all_doc_ids = load_all_doc_ids(doc_ids_file)
+    settings = service.settings
+
+    # Prepend the fixed system message, dropping any client-supplied ones
+    messages = body.messages
+    if any(m.role == _SYSTEM_ROLE for m in messages):
+        messages = [m for m in messages if m.role != _SYSTEM_ROLE]
+    all_messages = [_SYSTEM_MESSAGE]
+    all_messages.extend(map(_to_chat_message, messages))
+
+    # Keep the system message, the first user turn and the most recent turns
+    # within the model's context window, leaving room for the answer
+    all_messages = trim_messages(
+        all_messages,
+        max_tokens=settings.llm.context_window - settings.llm.max_new_tokens,
+        sink=2,
+    )
 
-    # Instantiate ContextFilter
-    context_filter = ContextFilter(docs_ids=all_doc_ids) if body.use_context else None
+    # Without a caller-supplied filter, retrieval runs over every ingested document
+    context_filter = body.context_filter if body.use_context else None
 
-    if body.use_context and context_filter:
-        logger.info(f"Using context with {len(context_filter.docs_ids)} documents.")
-    else:
+    if not body.use_context:
         logger.info("Context is disabled for this request.")
+    elif context_filter is None or context_filter.docs_ids is None:
+        logger.info("Using context with all ingested documents.")
+    else:
+        logger.info("Using context with %d documents.", len(context_filter.docs_ids))
 
     if body.stream:
         try:
-            completion_gen = service.stream_chat(
+            # Retrieval and prompt setup block, so keep them off the event loop.
+            # The token generator itself is iterated in the threadpool by
+            # sse_keep_alive.
+            completion_gen = await run_in_threadpool(
+                service.stream_chat,
                 messages=all_messages,
                 use_context=body.use_context,
                 context_filter=context_filter,
             )
             return StreamingResponse(
-                to_openai_sse_stream(
-                    completion_gen.response,
-                    completion_gen.sources if body.include_sources else None,
+                sse_keep_alive(
+                    to_openai_sse_stream(
+                        completion_gen.response,
+                        completion_gen.sources if body.include_sources else None,
+                    )
                 ),
                 media_type="text/event-stream",
+                headers=SSE_HEADERS,
             )
         except Exception as e:
             logger.exception("Error during streaming chat completion.")
             raise HTTPException(status_code=500, detail="Internal Server Error")
     else:
         try:
-            completion = service.chat(
+            completion = await run_in_threadpool(
+                service.chat,
                 messages=all_messages,
                 use_context=body.use_context,
                 context_filter=context_filter,
@@ -1,3 +1,5 @@
+from typing import Annotated
+
 from fastapi import APIRouter, Depends, Request
 from pydantic import BaseModel
 from starlette.responses import StreamingResponse
@@ -7,7 +9,12 @@ from private_gpt.open_ai.openai_models import (
     OpenAICompletion,
     OpenAIMessage,
 )
-from private_gpt.server.chat.chat_router import ChatBody, chat_completion
+from private_gpt.server.chat.chat_router import (
+    ChatBody,
+    chat_completion,
+    get_chat_service,
+)
+from private_gpt.server.chat.chat_service import ChatService
 from private_gpt.server.utils.auth import authenticated
 
 completions_router = APIRouter(prefix="/v1", dependencies=[Depends(authenticated)])
@@ -50,8 +57,10 @@ class CompletionsBody(BaseModel):
         }
     },
 )
-def prompt_completion(
-    request: Request, body: CompletionsBody
+async def prompt_completion(
+    request: Request,
+    body: CompletionsBody,
+    service: Annotated[ChatService, Depends(get_chat_service)],
 ) -> OpenAICompletion | StreamingResponse:
     """We recommend most users use our Chat completions API.
 
@@ -89,4 +98,4 @@ def prompt_completion(
         include_sources=body.include_sources,
         context_filter=body.context_filter,
     )
-    return chat_completion(request, chat_body)
+    return await chat_completion(request, chat_body, service)
@@ -9,6 +9,7 @@ from private_gpt.components.llm.prompt_helper import (
     MistralPromptStyle,
     TagPromptStyle,
     get_prompt_style,
+    trim_messages,
 )
 
 
@@ -194,3 +195,40 @@ def test_llama3_prompt_style_with_assistant_response():
     )
 
     assert prompt_style.messages_to_prompt(messages) == expected_prompt
+
+
+def _words(text: str) -> list[str]:
+    return text.split()
+
+
+def test_trim_messages_keeps_conversation_within_budget():
+    messages = [
+        ChatMessage(content="system prompt", role=MessageRole.SYSTEM),
+        ChatMessage(content="first question", role=MessageRole.USER),
+    ]
+    assert trim_messages(messages, max_tokens=10, tokenizer=_words) == messages
+
+
+def test_trim_messages_keeps_sink_and_recent_window():
+    messages = [ChatMessage(content="system prompt", role=MessageRole.SYSTEM)]
+    for i in range(10):
+        messages.append(ChatMessage(content=f"question {i}", role=MessageRole.USER))
+        messages.append(ChatMessage(content=f"answer {i}", role=MessageRole.ASSISTANT))
+    messages.append(ChatMessage(content="last question", role=MessageRole.USER))
+
+    trimmed = trim_messages(messages, max_tokens=10, sink=1, recent=3, tokenizer=_words)
+
+    assert trimmed == [messages[0], *messages[-3:]]
+
+
+def test_trim_messages_drops_assistant_turns_first():
+    messages = [
+        ChatMessage(content="system prompt", role=MessageRole.SYSTEM),
+        ChatMessage(content="short question", role=MessageRole.USER),
+        ChatMessage(content="a very long answer indeed", role=MessageRole.ASSISTANT),
+        ChatMessage(content="last question", role=MessageRole.USER),
+    ]
+
+    trimmed = trim_messages(messages, max_tokens=6, sink=1, recent=3, tokenizer=_words)
+
+    assert trimmed == [messages[0], messages[1], messages[3]]
@@ -0,0 +1,31 @@
+import atexit
+from functools import lru_cache
+from pymilvus import connections
+
+# Alias used implicitly by Collection(...) and utility.* when no 'using' is given
+DEFAULT_ALIAS = "default"
+
+
+@lru_cache(maxsize=None)
+def get_connection(host: str = 'localhost', port: str = '19530', db_name: str = 'default') -> str:
+    """
+    Connects to Milvus once per (host, port, db_name) and returns the connection alias.
+    The first connection is registered under the 'default' alias; connections to other
+    servers or databases get an alias of their own, so they never overwrite each other.
+    All connections are closed when the interpreter exits.
+
+    Args:
+        host (str): Milvus server host.
+        port (str): Milvus server port.
+        db_name (str): Milvus database name.
+
+    Returns:
+        str: The alias to pass as 'using' to pymilvus calls.
+    """
+    if connections.has_connection(DEFAULT_ALIAS):
+        alias = f"{host}:{port}/{db_name}"
+    else:
+        alias = DEFAULT_ALIAS
+    connections.connect(alias=alias, host=host, port=port, db_name=db_name)
+    atexit.register(connections.disconnect, alias)
+    return alias
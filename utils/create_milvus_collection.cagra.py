@@ -8,6 +8,7 @@ from pymilvus import (
 )
 import sys
 import logging
+from typing import Optional
 
 def setup_logging():
     """
@@ -28,7 +29,10 @@ def create_milvus_collection(
     port: str = '19530',
     collection_name: str = 'chatgspp',
     dim: int = 768,
-    enable_overwrite: bool = False
+    enable_overwrite: bool = False,
+    vector_dtype: DataType = DataType.FLOAT_VECTOR,
+    build_algo: str = "NN_DESCENT",
+    index_params: Optional[dict] = None
 ):
     """
     Creates a Milvus collection with the specified schema and GPU-based index.
@@ -40,6 +44,11 @@ def create_milvus_collection(
         collection_name (str): Name of the collection to create.
         dim (int): Dimension of the embedding.
         enable_overwrite (bool): If True, drops the existing collection before creation.
+        vector_dtype (DataType): Storage type of the embedding. DataType.FLOAT16_VECTOR halves
+            vector size and search bandwidth (Milvus >= 2.4), but the inserting client must send
+            float16 vectors (e.g. np.float16 arrays) instead of float32 lists.
+        build_algo (str): CAGRA graph build algorithm, "NN_DESCENT" (faster builds) or "IVF_PQ" (higher recall).
+        index_params (dict): Overrides for individual GPU_CAGRA parameters (e.g. {"team_size": 16}).
     """
     logger = setup_logging()
 
@@ -70,7 +79,7 @@ def create_milvus_collection(
 
     embedding_field = FieldSchema(
         name="embedding",
-        dtype=DataType.FLOAT_VECTOR,
+        dtype=vector_dtype,
         dim=dim,
         is_primary=False,
         auto_id=False
@@ -109,21 +118,26 @@ def create_milvus_collection(
     # So, make sure that your instance of Milvus is configured to use GPUs
     # Plus, make sure the necessary GPU resources are available (as defined within your milvus config file, milvus.yaml or whatever)
 
-    index_params = {
+    cagra_params = {
+        "intermediate_graph_degree": 48,     # Affects recall and build time by determining the graph’s degree before pruning (~2x build memory vs 21, higher recall)
+        "graph_degree": 32,                  # Sets the graph's degree after pruning. Must be smaller than intermediate_graph_degree
+        "build_algo": build_algo,            # Chooses the graph generation algorithm (IVF_PQ for higher recall or NN_DESCENT for faster builds with potentially lower recall)
+        "itopk_size": 256,                   # Size of intermediate results during the search. Must be at least equal to the final top-K value and typically a power of 2
+        "search_width": 8,                   # Number of entry points into the CAGRA graph during the search. Higher values can improve recall but may impact speed
+        "min_iterations": 5,                 # Controls the search iteration process. Defaults to 0 (automatic determination)
+        "max_iterations": 15,                # Controls the search iteration process. Defaults to 0 (automatic determination)
+        "team_size": 32,                     # Number of CUDA threads used for calculating metric distances on the GPU. A full warp (32) gives coalesced loads at dim=768. Defaults to 0 (automatic determination)
+        "top-K": 50,                         # Number of returned docs in the search. Higher values can improve recall but may impact speed.
+        "adapt_for_cpu": False,              # Keep the index GPU-only (True builds on GPU but searches on CPU)
+        "cache_dataset_on_device": True      # cache the original dataset in GPU memory (improves recall, but more GPU intensive). Only keep True if the vectors fit in the GPU memory budget
+    }
+    if index_params:
+        cagra_params.update(index_params)
+
+    index_config = {
         "index_type": "GPU_CAGRA",
         "metric_type": "IP",  # Options: "L2", "IP", "COSINE"
-        "params": {
-            "intermediate_graph_degree": 21,     # Affects recall and build time by determining the graph’s degree before pruning
-            "graph_degree": 16,                  # Sets the graph's degree after pruning. Must be smaller than intermediate_graph_degree
-            "build_algo": "NN_DESCENT",          # Chooses the graph generation algorithm (IVF_PQ for higher recall or NN_DESCENT for faster builds with potentially lower recall)
-            "itopk_size": 256,                   # Size of intermediate results during the search. Must be at least equal to the final top-K value and typically a power of 2
-            "search_width": 8,                   # Number of entry points into the CAGRA graph during the search. Higher values can improve recall but may impact speed
-            "min_iterations": 5,                 # Controls the search iteration process. Defaults to 0 (automatic determination)
-            "max_iterations": 15,                # Controls the search iteration process. Defaults to 0 (automatic determination)
-            "team_size": 16,                     # Number of CUDA threads used for calculating metric distances on the GPU. Defaults to 0 (automatic determination)
-            "top-K": 50,                         # Number of returned docs in the search. Higher values can improve recall but may impact speed.
-            "cache_dataset_on_device": True      # cache the original dataset in GPU memory (improves recall, but more GPU intensive)
-        }
+        "params": cagra_params
     }
 
     try:
@@ -133,8 +147,8 @@ def create_milvus_collection(
             logger.info(f"Index already exists on 'embedding' in collection '{collection_name}'.")
         else:
             # Create the index
-            collection.create_index(field_name="embedding", index_params=index_params)
-            logger.info(f"GPU_CAGRA index created on 'embedding' with params: {index_params}")
+            collection.create_index(field_name="embedding", index_params=index_config)
+            logger.info(f"GPU_CAGRA index created on 'embedding' with params: {index_config}")
     except Exception as e:
         logger.error(f"An error occurred while creating the index: {e}")
         sys.exit(1)
@@ -28,7 +28,8 @@ def create_milvus_collection(
     port: str = '19530',
     collection_name: str = 'chatgspp',
     dim: int = 384,
-    enable_overwrite: bool = False
+    enable_overwrite: bool = False,
+    vector_dtype: DataType = DataType.FLOAT_VECTOR
 ):
     """
     Creates a Milvus collection with the specified schema and index.
@@ -40,6 +41,9 @@ def create_milvus_collection(
         collection_name (str): Name of the collection to create.
         dim (int): Dimension of the embedding.
         enable_overwrite (bool): If True, drops the existing collection before creation.
+        vector_dtype (DataType): Storage type of the embedding. DataType.FLOAT16_VECTOR halves
+            vector size and search bandwidth (Milvus >= 2.4), but the inserting client must send
+            float16 vectors (e.g. np.float16 arrays) instead of float32 lists.
     """
     logger = setup_logging()
 
@@ -70,7 +74,7 @@ def create_milvus_collection(
 
     embedding_field = FieldSchema(
         name="embedding",
-        dtype=DataType.FLOAT_VECTOR,
+        dtype=vector_dtype,
         dim=dim,
         is_primary=False,
         auto_id=False
@@ -28,7 +28,8 @@ def create_milvus_collection(
     port: str = '19530',
     collection_name: str = 'chatgspp',
     dim: int = 384,
-    enable_overwrite: bool = False
+    enable_overwrite: bool = False,
+    vector_dtype: DataType = DataType.FLOAT_VECTOR
 ):
     """
     Creates a Milvus collection with the specified schema and index.
@@ -40,6 +41,9 @@ def create_milvus_collection(
         collection_name (str): Name of the collection to create.
         dim (int): Dimension of the embedding.
         enable_overwrite (bool): If True, drops the existing collection before creation.
+        vector_dtype (DataType): Storage type of the embedding. DataType.FLOAT16_VECTOR halves
+            vector size and search bandwidth (Milvus >= 2.4), but the inserting client must send
+            float16 vectors (e.g. np.float16 arrays) instead of float32 lists.
     """
     logger = setup_logging()
 
@@ -70,7 +74,7 @@ def create_milvus_collection(
 
     embedding_field = FieldSchema(
         name="embedding",
-        dtype=DataType.FLOAT_VECTOR,
+        dtype=vector_dtype,
         dim=dim,
         is_primary=False,
         auto_id=False
@@ -107,11 +111,11 @@ def create_milvus_collection(
     # Step 5: Create an Index (for the db's nearest neightbor search engine)
     index_params = {
         "index_type": "HNSW",
-        "metric_type": "IP",  # Options: "L2", "IP", "COSINE"
+        "metric_type": "IP",  # Options: "L2", "IP", "COSINE". IP only matches COSINE ranking if the embeddings are L2-normalized
         "params": {
-            "M": 32,               # M defines tha maximum number of outgoing connections in the graph. Higher M leads to higher accuracy/run_time at fixed ef/efConstruction
-            "efConstruction": 10,  # ef_construction controls index search speed/build speed tradeoff. Increasing the efConstruction parameter may enhance index quality, but it also tends to lengthen the indexing time
-            "ef": 5                # Parameter controlling query time/accuracy trade-off. Higher ef leads to more accurate but slower search (min = top-k)
+            "M": 32,                # M defines tha maximum number of outgoing connections in the graph. Higher M leads to higher accuracy/run_time at fixed ef/efConstruction (consider 48 for 768-dim embeddings)
+            "efConstruction": 200,  # ef_construction controls index search speed/build speed tradeoff. Increasing the efConstruction parameter may enhance index quality, but it also tends to lengthen the indexing time (keep >= 2 * M; try 400 if recall is still low)
+            "ef": 64                # Parameter controlling query time/accuracy trade-off. Higher ef leads to more accurate but slower search (min = top-k)
         }
     }
 
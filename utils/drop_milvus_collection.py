@@ -17,21 +17,27 @@ def setup_logging():
 
 def list_collections(logger):
     """
-    Lists all existing collections in Milvus.
+    Lists all existing collections in Milvus and returns their names.
     """
     try:
         collections = utility.list_collections()
-        if collections:
-            logger.info("Existing Collections:")
-            for idx, name in enumerate(collections, start=1):
-                logger.info(f"  {idx}. {name}")
-        else:
-            logger.info("No collections found in Milvus.")
     except Exception as e:
         logger.error(f"Failed to list collections: {e}")
         sys.exit(1)
+    log_collections(logger, collections)
+    return collections
+
+def log_collections(logger, collections):
+    """
+    Logs the given collection names as a single message.
+    """
+    if collections:
+        lines = "\n".join(f"  {idx}. {name}" for idx, name in enumerate(collections, start=1))
+        logger.info(f"Existing Collections:\n{lines}")
+    else:
+        logger.info("No collections found in Milvus.")
 
-def drop_collection(collection_name: str, host: str, port: str, logger):
+def drop_collection(collection_name: str, host: str, port: str, logger, assume_yes: bool = False):
     """
     Drops the specified Milvus collection after confirmation.
     
@@ -40,6 +46,7 @@ def drop_collection(collection_name: str, host: str, port: str, logger):
         host (str): Milvus server host.
         port (str): Milvus server port.
         logger (logging.Logger): Logger instance.
+        assume_yes (bool): Skip the interactive confirmation prompt.
     """
     # Step 1: Connect to Milvus
     try:
@@ -62,13 +69,17 @@ def drop_collection(collection_name: str, host: str, port: str, logger):
     
     # Optional: List all collections before deletion
     logger.info("Current Collections in Milvus:")
-    list_collections(logger)
+    existing_collections = list_collections(logger)
     
-    # Step 3: Confirm Deletion
-    confirmation = input(f"\nAre you sure you want to drop the collection '{collection_name}'? This action cannot be undone. (yes/no): ").strip().lower()
-    if confirmation not in ['yes', 'y']:
-        logger.info("Collection drop aborted by the user.")
-        sys.exit(0)
+    # Step 3: Confirm Deletion (prompt only when attached to a terminal)
+    if not assume_yes:
+        if not sys.stdin.isatty():
+            logger.error("Refusing to drop the collection without confirmation. Pass --yes to run non-interactively.")
+            sys.exit(1)
+        confirmation = input(f"\nAre you sure you want to drop the collection '{collection_name}'? This action cannot be undone. (yes/no): ").strip().lower()
+        if confirmation not in ['yes', 'y']:
+            logger.info("Collection drop aborted by the user.")
+            sys.exit(0)
     
     # Step 4: Drop the Collection
     try:
@@ -79,9 +90,9 @@ def drop_collection(collection_name: str, host: str, port: str, logger):
         logger.error(f"Failed to drop collection '{collection_name}': {e}")
         sys.exit(1)
     
-    # Optional: List collections after deletion
+    # Optional: List collections after deletion (derived locally, no extra round-trip)
     logger.info("\nCollections after deletion:")
-    list_collections(logger)
+    log_collections(logger, [name for name in existing_collections if name != collection_name])
 
 def main():
     # Setup logging
@@ -107,6 +118,11 @@ def main():
         default="19530",
         help="Milvus server port. Default is '19530'."
     )
+    parser.add_argument(
+        "-y", "--yes",
+        action="store_true",
+        help="Drop the collection without asking for confirmation."
+    )
     
     args = parser.parse_args()
     
@@ -115,7 +131,8 @@ def main():
         collection_name=args.collection,
         host=args.host,
         port=args.port,
-        logger=logger
+        logger=logger,
+        assume_yes=args.yes
     )
 
 if __name__ == "__main__":
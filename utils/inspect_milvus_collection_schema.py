@@ -1,4 +1,5 @@
 from pymilvus import connections, Collection, utility
+import sys
 
 def inspect_collection_schema(collection_name, host='localhost', port='19530'):
     # Step 1: Connect to Milvus
@@ -13,24 +14,28 @@ def inspect_collection_schema(collection_name, host='localhost', port='19530'):
     collection = Collection(collection_name)
     collection.load()
 
-    # Step 4: Retrieve and print schema
+    # Step 4: Retrieve and print schema (collected into a single write)
     schema = collection.schema
-    print(f"Schema for Collection '{collection_name}':")
+    lines = [f"Schema for Collection '{collection_name}':"]
+    field_names = set()
     for field in schema.fields:
-        print(f" - Field Name: {field.name}")
-        print(f"   Description: {field.description}")
-        print(f"   Type: {field.dtype.name}")
-        print(f"   Parameters: {field.params}")
-        print(f"   Is Primary: {field.is_primary}")
-        print(f"   Auto ID: {field.auto_id}")
-        print()
+        field_names.add(field.name)
+        lines.append(
+            f" - Field Name: {field.name}\n"
+            f"   Description: {field.description}\n"
+            f"   Type: {field.dtype.name}\n"
+            f"   Parameters: {field.params}\n"
+            f"   Is Primary: {field.is_primary}\n"
+            f"   Auto ID: {field.auto_id}\n"
+        )
 
     # Step 5: Check if 'file_name' field exists
-    field_names = [field.name for field in schema.fields]
     if "file_name" in field_names:
-        print("'file_name' field exists in the schema.")
+        lines.append("'file_name' field exists in the schema.")
     else:
-        print("'file_name' field does NOT exist in the schema.")
+        lines.append("'file_name' field does NOT exist in the schema.")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 if __name__ == "__main__":
     inspect_collection_schema("chatgspp")
@@ -3,6 +3,12 @@ import json
 import sys
 import logging
 
+try:
+    import orjson
+    json_loads = orjson.loads  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+except ImportError:
+    json_loads = json.loads
+
 def setup_logging():
     """
     Sets up the logging configuration.
@@ -64,27 +70,37 @@ def inspect_meta_fields(
         logger.error(f"Error checking for $meta field: {e}")
         sys.exit(1)
 
-    # Step 4: Query the $meta Field
+    # Step 4: Query the $meta Field, streaming results in batches
     try:
-        results = collection.query(
+        iterator = collection.query_iterator(
+            batch_size=min(limit, 1000),
+            limit=limit,
             expr="",
-            output_fields=["id", "$meta"],
-            limit=limit
+            output_fields=["id", "$meta"]
         )
 
-        if not results:
+        idx = 0
+        try:
+            while True:
+                batch = iterator.next()
+                if not batch:
+                    break
+                for res in batch:
+                    idx += 1
+                    logger.info(f"\nRecord {idx}:")
+                    logger.info(f"  ID: {res['id']}")
+                    meta = res.get('$meta', '{}')
+                    try:
+                        meta_json = json_loads(meta)
+                        logger.info(f"  Metadata Fields: {json.dumps(meta_json, indent=4)}")
+                    except json.JSONDecodeError:
+                        logger.warning(f"  Unable to parse $meta field: {meta}")
+        finally:
+            iterator.close()
+
+        if idx == 0:
             logger.info("No records found in the collection.")
             sys.exit(0)
-
-        for idx, res in enumerate(results, start=1):
-            logger.info(f"\nRecord {idx}:")
-            logger.info(f"  ID: {res['id']}")
-            meta = res.get('$meta', '{}')
-            try:
-                meta_json = json.loads(meta)
-                logger.info(f"  Metadata Fields: {json.dumps(meta_json, indent=4)}")
-            except json.JSONDecodeError:
-                logger.warning(f"  Unable to parse $meta field: {meta}")
     except Exception as e:
         logger.error(f"An error occurred while querying the $meta field: {e}")
         sys.exit(1)
@@ -1,11 +1,12 @@
-from pymilvus import connections, utility
+from pymilvus import utility
+from _milvus_conn import get_connection
 
 def list_milvus_collections(host='localhost', port='19530'):
-    # Step 1: Connect to Milvus
-    connections.connect(alias="default", host=host, port=port)
+    # Step 1: Connect to Milvus (reuses an existing connection)
+    alias = get_connection(host, port)
 
     # Step 2: List all collections
-    collections = utility.list_collections()
+    collections = utility.list_collections(using=alias)
 
     # Step 3: Display the collections
     if collections:
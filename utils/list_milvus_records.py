@@ -3,13 +3,28 @@ import csv
 import json
 import logging
 import sys
+import numpy as np
 from pymilvus import (
-    connections,
     Collection,
     utility,
     DataType
 )
-from typing import List, Dict, Any
+from _milvus_conn import get_connection
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+# Fields listed for every record
+OUTPUT_FIELDS = ["id", "file_name", "embedding"]
+
+# Milvus rejects queries whose offset + limit exceeds this result window
+QUERY_WINDOW = 16384
+
+# Filter matching every record ('id' is a VARCHAR primary key); offsets are
+# only honoured on filtered queries
+ALL_RECORDS_EXPR = 'id != ""'
+
+# Encodings for exported embeddings: a JSON array, or the hex of the raw vector
+# bytes (little-endian) at the given precision
+EMBEDDING_PRECISIONS = ["json", "fp32", "fp16", "int8"]
 
 
 def setup_logging():
@@ -28,6 +43,16 @@ def setup_logging():
     return logger
 
 
+def positive_int(value: str) -> int:
+    """
+    Argument type for counts that must be at least 1.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
 def parse_arguments():
     """
     Parses command-line arguments.
@@ -76,6 +101,20 @@ def parse_arguments():
         default=5,
         help="Number of elements to display from the start and end of the embedding vector when truncating. Default is 5."
     )
+    parser.add_argument(
+        "--precision",
+        type=str,
+        choices=EMBEDDING_PRECISIONS,
+        default="json",
+        help="Encoding of exported embeddings: a JSON array, or hex-encoded fp32/fp16/int8 bytes. "
+             "int8 adds a per-vector Scale column (embedding = int8 * scale). Default is 'json'."
+    )
+    parser.add_argument(
+        "--page_size",
+        type=positive_int,
+        default=1000,
+        help="Number of records fetched from Milvus per request. Default is 1000."
+    )
     return parser.parse_args()
 
 
@@ -98,7 +137,93 @@ def truncate_embedding(embedding: List[float], display_length: int = 5) -> str:
         return f"{start} ... {end}"
 
 
-def list_all_records(collection: Collection, limit: int, export_path: str = None, truncate: bool = False, display_length: int = 5):
+def encode_embedding(embedding: List[float], precision: str = "json") -> Tuple[str, Optional[float]]:
+    """
+    Encodes an embedding vector for export.
+    
+    Args:
+        embedding (List[float]): The embedding vector.
+        precision (str): One of EMBEDDING_PRECISIONS.
+    
+    Returns:
+        Tuple[str, Optional[float]]: The encoded vector, and the int8 scale (None for other precisions).
+    """
+    if precision == "json":
+        return json.dumps(embedding, separators=(",", ":")), None
+    vector = np.asarray(embedding, dtype=np.float32)
+    if precision == "fp32":
+        return vector.astype("<f4").tobytes().hex(), None
+    if precision == "fp16":
+        return vector.astype("<f2").tobytes().hex(), None
+    # int8: symmetric per-vector quantization, reconstructed as int8 * scale
+    scale = float(np.abs(vector).max()) / 127 if vector.size else 0.0
+    if scale == 0.0:
+        scale = 1.0
+    return np.round(vector / scale).astype(np.int8).tobytes().hex(), scale
+
+
+def iter_all_records(collection: Collection, batch_size: int = 1000, limit: int = -1) -> Iterator[Dict[str, Any]]:
+    """
+    Yields records of the collection using a query iterator, so only one
+    batch is held in memory at a time and the query result window is not hit.
+    
+    Args:
+        collection (Collection): The Milvus collection to query.
+        batch_size (int): Number of records fetched per round-trip.
+        limit (int): Maximum number of records to yield. -1 for all.
+    
+    Yields:
+        Dict[str, Any]: One record with the 'id', 'file_name' and 'embedding' fields.
+    """
+    iterator = collection.query_iterator(
+        batch_size=batch_size,
+        limit=limit,
+        expr="",
+        output_fields=OUTPUT_FIELDS
+    )
+    try:
+        while True:
+            batch = iterator.next()
+            if not batch:
+                break
+            yield from batch
+    finally:
+        iterator.close()
+
+
+def iter_records(collection: Collection, limit: int, page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """
+    Yields up to 'limit' records, fetching them one page (offset/limit) at a time.
+    Falls back to a query iterator when the pages would go past the query window.
+    
+    Args:
+        collection (Collection): The Milvus collection to query.
+        limit (int): Maximum number of records to yield. -1 for all.
+        page_size (int): Number of records fetched per round-trip.
+    
+    Yields:
+        Dict[str, Any]: One record with the 'id', 'file_name' and 'embedding' fields.
+    """
+    if limit == -1 or limit > QUERY_WINDOW:
+        yield from iter_all_records(collection, batch_size=page_size, limit=limit)
+        return
+
+    offset = 0
+    while offset < limit:
+        requested = min(page_size, limit - offset)
+        page = collection.query(
+            expr=ALL_RECORDS_EXPR,
+            output_fields=OUTPUT_FIELDS,
+            offset=offset,
+            limit=requested
+        )
+        yield from page
+        if len(page) < requested:
+            break
+        offset += requested
+
+
+def list_all_records(collection: Collection, limit: int, export_path: str = None, truncate: bool = False, display_length: int = 5, page_size: int = 1000, precision: str = "json"):
     """
     Lists the 'id', 'file_name', and 'embedding' fields from the collection.
     
@@ -108,32 +233,19 @@ def list_all_records(collection: Collection, limit: int, export_path: str = None
         export_path (str, optional): Path to export the records as a CSV file.
         truncate (bool): Whether to truncate embeddings in console output.
         display_length (int): Number of elements to display from the start and end when truncating.
+        page_size (int): Number of records fetched from Milvus per round-trip.
+        precision (str): Encoding of exported embeddings, one of EMBEDDING_PRECISIONS.
     """
     try:
         if limit == -1:
-            # Retrieve all records
-            total = collection.num_entities
-            logger.info(f"Total number of records in the collection: {total}")
-            if total == 0:
-                logger.info("The collection is empty.")
-                return
-            # Query with limit as total
-            results = collection.query(
-                expr="",
-                output_fields=["id", "file_name", "embedding"],
-                limit=total
-            )
+            logger.info("Listing all records:")
         else:
-            # Retrieve up to 'limit' records
-            results = collection.query(
-                expr="",
-                output_fields=["id", "file_name", "embedding"],
-                limit=limit
-            )
             logger.info(f"Listing up to {limit} records:")
+        # Fetch records page by page instead of materializing them all at once
+        results = iter_records(collection, limit, page_size)
         
         if export_path:
-            export_to_csv(results, export_path)
+            export_to_csv(results, export_path, precision)
             logger.info(f"Successfully exported records to {export_path}")
         else:
             # Print records to console
@@ -157,26 +269,34 @@ def list_all_records(collection: Collection, limit: int, export_path: str = None
         sys.exit(1)
 
 
-def export_to_csv(records: List[Dict[str, Any]], output_file: str):
+def export_to_csv(records: Iterable[Dict[str, Any]], output_file: str, precision: str = "json"):
     """
-    Exports the records to a CSV file.
+    Exports the records to a CSV file, writing each record as it is produced.
     
     Args:
-        records (List[Dict[str, Any]]): List of records retrieved from Milvus.
+        records (Iterable[Dict[str, Any]]): Records retrieved from Milvus.
         output_file (str): Path to the output CSV file.
+        precision (str): Encoding of the embeddings, one of EMBEDDING_PRECISIONS.
+            With 'int8' a Scale column is added; the embedding is int8 * scale.
     """
     try:
         with open(output_file, mode='w', newline='', encoding='utf-8') as csvfile:
             writer = csv.writer(csvfile)
             # Write header
-            writer.writerow(["Record_Number", "ID", "File_Name", "Embedding"])
+            header = ["Record_Number", "ID", "File_Name", "Embedding"]
+            if precision == "int8":
+                header.append("Scale")
+            writer.writerow(header)
             for idx, record in enumerate(records, start=1):
                 record_id = record.get("id", "")
                 file_name = record.get("file_name", "")
                 embedding = record.get("embedding", [])
-                # Convert embedding list to a JSON string for CSV
-                embedding_str = json.dumps(embedding)
-                writer.writerow([idx, record_id, file_name, embedding_str])
+                # Convert embedding list to a string for CSV
+                embedding_str, scale = encode_embedding(embedding, precision)
+                row = [idx, record_id, file_name, embedding_str]
+                if scale is not None:
+                    row.append(scale)
+                writer.writerow(row)
     except Exception as e:
         logger.error(f"Failed to export records to CSV: {e}")
         sys.exit(1)
@@ -187,20 +307,20 @@ def main():
     logger = setup_logging()
     args = parse_arguments()
     
-    # Connect to Milvus
+    # Connect to Milvus (reuses an existing connection)
     try:
-        connections.connect(host=args.host, port=args.port)
+        alias = get_connection(args.host, args.port)
         logger.info(f"Connected to Milvus at {args.host}:{args.port}")
     except Exception as e:
         logger.error(f"Failed to connect to Milvus: {e}")
         sys.exit(1)
     
     # Check if collection exists
-    if not utility.has_collection(args.collection):
+    if not utility.has_collection(args.collection, using=alias):
         logger.error(f"Collection '{args.collection}' does not exist.")
         sys.exit(1)
     
-    collection = Collection(name=args.collection)
+    collection = Collection(name=args.collection, using=alias)
     logger.info(f"Loaded collection '{args.collection}'.")
     
     # List 'id', 'file_name', and 'embedding' fields
@@ -209,7 +329,9 @@ def main():
         limit=args.limit,
         export_path=args.export,
         truncate=args.truncate,
-        display_length=args.display_length
+        display_length=args.display_length,
+        page_size=args.page_size,
+        precision=args.precision
     )
 
 
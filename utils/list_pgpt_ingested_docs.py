@@ -1,3 +1,5 @@
+import sys
+
 from pgpt_python.client import PrivateGPTApi
 
 # create PGPTAPI client instance
@@ -6,6 +8,7 @@ client = PrivateGPTApi(base_url="http://localhost:8001")
 # app health check
 #print(client.health.health())
 
-# list ingested documents
-for doc in client.ingestion.list_ingested().data:
-    print(doc.doc_id)
+# list ingested documents (one write for all IDs, instead of a flush per print)
+doc_ids = [doc.doc_id for doc in client.ingestion.list_ingested().data]
+if doc_ids:
+    sys.stdout.write("\n".join(doc_ids) + "\n")
@@ -3,6 +3,8 @@ import shutil
 import argparse
 from pathlib import Path
 
+from separate_ingested_data import move_file
+
 def revert_split_files(output_parent_dir, subdirectory_prefix='chunk_', action='move'):
     """
     Moves files from subdirectories back to the parent directory and removes empty subdirectories.
@@ -19,8 +21,9 @@ def revert_split_files(output_parent_dir, subdirectory_prefix='chunk_', action='
         print(f"Error: Parent directory '{parent}' does not exist or is not a directory.")
         return
 
-    # Identify subdirectories to process
-    subdirs = [d for d in parent.iterdir() if d.is_dir() and d.name.startswith(subdirectory_prefix)]
+    # Identify subdirectories to process (DirEntry caches the file type from readdir)
+    with os.scandir(parent) as entries:
+        subdirs = [e for e in entries if e.is_dir() and e.name.startswith(subdirectory_prefix)]
 
     if not subdirs:
         print(f"No subdirectories starting with '{subdirectory_prefix}' found in '{parent}'.")
@@ -28,33 +31,45 @@ def revert_split_files(output_parent_dir, subdirectory_prefix='chunk_', action='
 
     print(f"Found {len(subdirs)} subdirectories to process.")
 
+    # Names already present in the parent directory, used for collision checks
+    with os.scandir(parent) as entries:
+        existing_names = {e.name for e in entries}
+
+    # Subdirectories live inside the parent, so a rename is possible unless one of
+    # them is a mount point; check the device of each one once
+    parent_dev = os.stat(parent).st_dev
+
     for subdir in subdirs:
-        print(f"\nProcessing subdirectory: {subdir}")
-        files = [f for f in subdir.iterdir() if f.is_file()]
+        print(f"\nProcessing subdirectory: {subdir.path}")
+        with os.scandir(subdir.path) as entries:
+            files = [e for e in entries if e.is_file()]
         if not files:
-            print(f" - No files found in '{subdir}'. Skipping.")
+            print(f" - No files found in '{subdir.path}'. Skipping.")
             continue
 
-        for file_path in files:
-            destination = parent / file_path.name
+        same_device = subdir.stat().st_dev == parent_dev
+
+        for entry in files:
+            destination = os.path.join(parent, entry.name)
 
             # Check for name collisions
-            if destination.exists():
-                print(f" - Warning: '{destination.name}' already exists in the parent directory. Skipping file.")
+            if entry.name in existing_names:
+                print(f" - Warning: '{entry.name}' already exists in the parent directory. Skipping file.")
                 continue
 
             try:
                 if action == 'move':
-                    shutil.move(str(file_path), str(destination))
+                    move_file(entry.path, destination, same_device)
                 else:
-                    shutil.copy2(str(file_path), str(destination))
-                print(f" - {'Moved' if action == 'move' else 'Copied'}: {file_path.name}")
+                    shutil.copy2(entry.path, destination)
+                existing_names.add(entry.name)
+                print(f" - {'Moved' if action == 'move' else 'Copied'}: {entry.name}")
             except Exception as e:
-                print(f" - Error processing file '{file_path}': {e}")
+                print(f" - Error processing file '{entry.path}': {e}")
 
         # After moving/copying files, remove the empty subdirectory
         try:
-            subdir.rmdir()
+            os.rmdir(subdir.path)
             print(f" - Removed empty subdirectory: {subdir.name}")
         except OSError as e:
             print(f" - Error removing subdirectory '{subdir.name}': {e}")
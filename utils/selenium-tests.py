@@ -1,22 +1,36 @@
+import atexit
+import functools
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 
-def test_webdriver():
+@functools.cache
+def _driver():
+    """
+    Creates the headless Chrome driver once; it's reused by every test and quit at exit.
+    """
     chrome_options = Options()
     chrome_options.add_argument("--headless")  # Run in headless mode
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-background-networking")
     chrome_options.add_argument("window-size=1920,1080")
+    chrome_options.page_load_strategy = "eager"  # Don't wait for images/stylesheets to finish loading
 
     service = Service(executable_path='/usr/local/bin/chromedriver')  # Update if different
 
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    atexit.register(driver.quit)
+    return driver
+
+def test_webdriver():
     try:
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        driver = _driver()
         driver.get("https://www.google.com")
         print("Title:", driver.title)
-        driver.quit()
     except Exception as e:
         print("Error:", e)
 
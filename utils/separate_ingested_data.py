@@ -2,10 +2,97 @@ import os
 import shutil
 import math
 import argparse
-import random
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def split_files_into_chunks(source_dir, output_parent_dir, num_chunks=4272, shuffle=True, action='copy'):
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# Default number of concurrent file operations; copies are I/O latency bound
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# FICLONE ioctl request (linux/fs.h): share the source's extents instead of copying bytes
+FICLONE = 0x40049409
+
+def _clone_file(src, dst):
+    """
+    Clones src into dst without copying data through user space: a reflink
+    (copy-on-write) clone on filesystems that support it (Btrfs, XFS), otherwise
+    an in-kernel os.copy_file_range (server-side copy on NFS 4.2).
+
+    Returns:
+        bool: True if the whole file was cloned.
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return True
+            except OSError:
+                pass
+        if hasattr(os, 'copy_file_range'):
+            try:
+                size = os.fstat(fsrc.fileno()).st_size
+                copied = 0
+                while copied < size:
+                    count = os.copy_file_range(fsrc.fileno(), fdst.fileno(), size - copied)
+                    if count == 0:
+                        break
+                    copied += count
+                return copied == size
+            except OSError:
+                pass
+    return False
+
+def fast_copy(src, dst):
+    """
+    Copies a file and its metadata like shutil.copy2, using the cheapest copy
+    mechanism the filesystem supports.
+    """
+    if _clone_file(src, dst):
+        shutil.copystat(src, dst)
+    else:
+        shutil.copy2(src, dst)
+
+def move_file(src, dst, same_device):
+    """
+    Moves a file. On the same device this is a single atomic rename; across
+    devices the file is copied with fast_copy and the source is removed.
+    """
+    if same_device:
+        os.replace(src, dst)
+    else:
+        fast_copy(src, dst)
+        os.unlink(src)
+
+def transfer_file(src, dst, action, same_device):
+    """
+    Moves or copies a single file. Errors are reported, not raised, so one bad
+    file doesn't abort the rest of the split.
+
+    Parameters:
+        src (str): File to move or copy.
+        dst (str): Destination path.
+        action (str): 'copy' to copy files, 'move' to move files.
+        same_device (bool): Whether src and dst are on the same filesystem.
+
+    Returns:
+        bool: True if the file was processed successfully.
+    """
+    try:
+        if action == 'move':
+            move_file(src, dst, same_device)
+        else:
+            fast_copy(src, dst)
+        return True
+    except Exception as e:
+        print(f"Error processing file '{src}': {e}")
+        return False
+
+def split_files_into_chunks(source_dir, output_parent_dir, num_chunks=4272, shuffle=True, action='copy', workers=DEFAULT_WORKERS):
     """
     Splits files from source_dir into num_chunks subdirectories within output_parent_dir.
 
@@ -13,8 +100,9 @@ def split_files_into_chunks(source_dir, output_parent_dir, num_chunks=4272, shuf
         source_dir (str): Path to the directory containing all files.
         output_parent_dir (str): Path where the subdirectories will be created.
         num_chunks (int): Number of subdirectories to create.
-        shuffle (bool): Whether to shuffle files before splitting.
+        shuffle (bool): Whether to distribute files randomly (by a hash of their name) instead of in order.
         action (str): 'copy' to copy files, 'move' to move files.
+        workers (int): Number of files moved/copied concurrently.
     """
     source = Path(source_dir)
     output_parent = Path(output_parent_dir)
@@ -27,8 +115,14 @@ def split_files_into_chunks(source_dir, output_parent_dir, num_chunks=4272, shuf
     # Create output parent directory if it doesn't exist
     output_parent.mkdir(parents=True, exist_ok=True)
 
-    # List all files in source directory
-    all_files = [f for f in source.iterdir() if f.is_file()]
+    # Moves within one filesystem are renames; check the devices once, not per file
+    same_device = os.stat(source).st_dev == os.stat(output_parent).st_dev
+    if action == 'move' and not same_device:
+        print("Source and output are on different filesystems; files will be copied, then removed.")
+
+    # List all files in source directory (DirEntry caches the file type from readdir)
+    with os.scandir(source) as entries:
+        all_files = [e for e in entries if e.is_file()]
     total_files = len(all_files)
 
     if total_files == 0:
@@ -42,37 +136,34 @@ def split_files_into_chunks(source_dir, output_parent_dir, num_chunks=4272, shuf
     print(f"Number of chunks: {num_chunks}")
     print(f"Files per chunk: {files_per_chunk}")
 
-    # Shuffle files if required
+    # Assign files to chunks
     if shuffle:
-        random.shuffle(all_files)
-        print("Files have been shuffled for random distribution.")
+        # A hash of the file name spreads files uniformly at random, without
+        # shuffling the whole list; the same file always lands in the same chunk
+        chunks = [[] for _ in range(num_chunks)]
+        for entry in all_files:
+            chunks[zlib.crc32(entry.name.encode('utf-8')) % num_chunks].append(entry)
+        print("Files have been assigned to chunks by name hash for random distribution.")
     else:
+        chunks = [all_files[i * files_per_chunk:(i + 1) * files_per_chunk] for i in range(num_chunks)]
         print("Files will be split in the order they appear.")
 
-    # Create and populate subdirectories
-    for i in range(num_chunks):
+    # Create all subdirectories up front so workers never race on mkdir
+    transfers = []
+    for i, chunk_files in enumerate(chunks):
         chunk_dir = output_parent / f"chunk_{i+1}"
         chunk_dir.mkdir(parents=True, exist_ok=True)
         print(f"\nCreating directory: {chunk_dir}")
 
-        # Determine the range of files for this chunk
-        start_idx = i * files_per_chunk
-        end_idx = start_idx + files_per_chunk
-        chunk_files = all_files[start_idx:end_idx]
-
-        # Move or copy files
-        for file_path in chunk_files:
-            destination = chunk_dir / file_path.name
-            try:
-                if action == 'move':
-                    shutil.move(str(file_path), str(destination))
-                else:
-                    shutil.copy2(str(file_path), str(destination))
-            except Exception as e:
-                print(f"Error processing file '{file_path}': {e}")
+        transfers.extend((entry.path, os.path.join(chunk_dir, entry.name)) for entry in chunk_files)
+        print(f"Assigned {len(chunk_files)} files to '{chunk_dir}'.")
 
-        print(f"Moved/Copied {len(chunk_files)} files to '{chunk_dir}'.")
+    # Move or copy files concurrently
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(lambda transfer: transfer_file(*transfer, action, same_device), transfers)
+        processed = sum(results)
 
+    print(f"\nMoved/Copied {processed} of {len(transfers)} files using {workers} workers.")
     print("\nFile splitting completed successfully.")
 
 def main():
@@ -80,8 +171,9 @@ def main():
     parser.add_argument('source_dir', type=str, help="Path to the source directory containing all files.")
     parser.add_argument('output_parent_dir', type=str, help="Path to the parent directory where chunks will be created.")
     parser.add_argument('--num_chunks', type=int, default=4272, help="Number of subdirectories to create. Default is 4272.")
-    parser.add_argument('--shuffle', action='store_true', help="Shuffle files before splitting for random distribution.")
+    parser.add_argument('--shuffle', action='store_true', help="Distribute files randomly (by a hash of their name) instead of in order.")
     parser.add_argument('--action', type=str, choices=['copy', 'move'], default='copy', help="Action to perform on files: 'copy' or 'move'. Default is 'copy'.")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help=f"Number of files moved/copied concurrently. Default is {DEFAULT_WORKERS}.")
 
     args = parser.parse_args()
 
@@ -90,7 +182,8 @@ def main():
         output_parent_dir=args.output_parent_dir,
         num_chunks=args.num_chunks,
         shuffle=args.shuffle,
-        action=args.action
+        action=args.action,
+        workers=args.workers
     )
 
 if __name__ == "__main__":
@@ -2,11 +2,19 @@ import signal
 import sys
 import re
 import os
-import time
+import csv
+import glob
+import json
+import math
 import logging
+import asyncio
+import time
+import codecs
+from collections import ChainMap, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
-import pandas as pd
-from multiprocessing import Process, Manager, current_process
+import aiohttp
+from multiprocessing import Process, Queue, Value, Lock, current_process, shared_memory
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -18,7 +26,7 @@ from selenium.common.exceptions import (
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
+from lxml import etree
 from logging.handlers import QueueHandler, QueueListener
 import hashlib
 from queue import Empty  # Import the Empty exception
@@ -35,8 +43,17 @@ signal.signal(signal.SIGTERM, signal_handler)
 
 # -------------------- Configuration --------------------
 
-# Regex pattern to match a URL
-HTTP_URL_PATTERN = r'^http[s]?://.+$'
+# Prefixes of absolute URLs
+HTTP_URL_PREFIXES = ("http://", "https://")
+
+# Compiled once for sanitize_filename: characters not allowed in filenames
+UNSAFE_FILENAME_CHARS = re.compile(r'[^\w\-_\. ]')
+
+# Length of the readable, URL-derived part of saved filenames (the rest is a hash of the URL)
+FILENAME_PREFIX_LENGTH = 100
+
+# Relative links that don't point to a crawlable page
+SKIPPED_LINK_PREFIXES = ("#", "mailto:", "tel:", "javascript:")
 
 # Define root domain to crawl
 DOMAIN = "gspp.berkeley.edu"
@@ -45,6 +62,12 @@ FULL_URL = "https://gspp.berkeley.edu/"
 # Parse the URL and get the domain
 LOCAL_DOMAIN = urlparse(FULL_URL).netloc
 
+# Precomputed for get_domain_hyperlinks: the domain's root URL, and the prefixes of its absolute
+# URLs (each ending where the host ends, so other hosts that merely start with the domain don't match)
+ROOT_URL = f"https://{LOCAL_DOMAIN}"
+DOMAIN_ROOT_URLS = frozenset((f"https://{LOCAL_DOMAIN}", f"http://{LOCAL_DOMAIN}"))
+DOMAIN_URL_PREFIXES = tuple(f"{root}{sep}" for root in sorted(DOMAIN_ROOT_URLS) for sep in "/?#")
+
 # Directories to store data
 TEXT_DIR = f"text/{LOCAL_DOMAIN}/"
 CSV_DIR = "ingested_data/"
@@ -53,10 +76,14 @@ CSV_DIR = "ingested_data/"
 os.makedirs(TEXT_DIR, exist_ok=True)
 os.makedirs(CSV_DIR, exist_ok=True)
 
+# Hashes of each page's text from previous crawls (url -> sha256), used to skip rewriting unchanged pages
+CONTENT_HASHES_FILE = "local_data/crawler_content_hashes.json"
+
 # Maximum number of pages to crawl
 MAX_PAGES = 100000000000  # Adjust as needed
 
-# Crawl delay (in seconds) to be respectful to the server
+# Crawl delay (in seconds) to be respectful to the server: the minimum time between two
+# requests, across all workers and their concurrent tasks
 CRAWL_DELAY = 3  # Adjust as needed
 
 # Path to ChromeDriver (if not in PATH, specify the full path)
@@ -66,12 +93,58 @@ CHROMEDRIVER_PATH = '/usr/local/bin/chromedriver'  # Replace with your path if n
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # Seconds to wait before retrying
 
+# Sizing of the seen-URL Bloom filter: expected number of URLs and false-positive rate
+SEEN_CAPACITY = 10_000_000
+SEEN_ERROR_RATE = 1e-6
+
+# Number of recently seen URLs each worker remembers exactly, in front of the Bloom filter
+RECENT_SEEN_SIZE = 65536
+
 # Number of worker processes
 MAX_WORKERS = 10  # Start with 1 for testing, increase as needed
 
+# Number of pages each worker process fetches concurrently
+CONCURRENCY = 8  # Adjust as needed
+
+# Maximum number of URLs sent to the workers in one queue message
+URL_BATCH_SIZE = 32
+
 # User-Agent string
 USER_AGENT = "GsppCrawler/1.0 (+http://www.example.com/crawler)"
 
+# Timeout (in seconds) for fetching a page, over plain HTTP or with Selenium
+PAGE_LOAD_TIMEOUT = 30
+
+# Only responses of these types are parsed; anything else (PDFs, images, ...) is skipped
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# Pages larger than this (in bytes) are skipped
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+
+# Size of the body chunks fed to the parser as a page downloads
+READ_CHUNK_SIZE = 32 * 1024
+
+# A <meta charset> declaration (or http-equiv content type) in the start of a page's HTML
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset', re.IGNORECASE)
+
+# Size of each worker's HTTP connection pool
+HTTP_POOL_SIZE = CONCURRENCY
+
+# How long (in seconds) resolved host addresses are reused; the crawl only ever hits one host
+DNS_CACHE_TTL = 300
+
+# Subresources Selenium doesn't load: they take most of a page's load time and add no text
+BLOCKED_RESOURCE_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.mp4", "*.webm", "*.mp3", "*.css"
+]
+
+# Text shown by pages that can only be read with JavaScript enabled
+JS_REQUIRED_MARKER = "You need to enable JavaScript to run this app."
+
+# Runs of whitespace, collapsed to single spaces in the extracted text
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
 # --------------------------------------------------------
 
 # -------------------- Logging Setup --------------------
@@ -116,163 +189,504 @@ def init_webdriver():
     chrome_options.add_argument("--disable-dev-shm-usage")  # Overcome limited resource problems
     chrome_options.add_argument(f"user-agent={USER_AGENT}")  # Set custom User-Agent
     chrome_options.add_argument("window-size=1920,1080")  # Ensure all elements load
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")  # Don't load or decode images
+    chrome_options.page_load_strategy = "eager"  # Return once the DOM is ready, not after every subresource
 
     # Initialize the Service object with the path to chromedriver
     service = Service(executable_path=CHROMEDRIVER_PATH)
 
     try:
         driver = webdriver.Chrome(service=service, options=chrome_options)
-        driver.set_page_load_timeout(30)  # Set timeout for page load
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)  # Set timeout for page load
+        # Block fonts, media, stylesheets and images at the network level
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCE_URLS})
         return driver
     except WebDriverException as e:
         logging.error(f"Error initializing WebDriver: {e}")
         raise e
 
+class BrowserRenderer:
+    """
+    Renders JavaScript-only pages with a worker's WebDriver. A WebDriver can
+    only drive one page at a time, so renders are serialized onto a single
+    thread, keeping the event loop free for the other in-flight fetches.
+    Chrome is only started on the first render, so workers that never meet a
+    JavaScript-only page don't pay for a browser at all.
+    """
+
+    def __init__(self):
+        self.driver = None
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def _render(self, url):
+        # Runs on the executor's single thread, so the driver is started at most once
+        if self.driver is None:
+            self.driver = init_webdriver()
+        return render_html(self.driver, url)
+
+    async def render(self, url):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._render, url)
+
+    def close(self):
+        self.executor.shutdown()
+        if self.driver is not None:
+            self.driver.quit()
+
+# -----------------------------------------------------------------
+
+# -------------------- HTTP Session Setup --------------------
+
+class RateLimiter:
+    """
+    Schedules the crawl's requests so that the server gets at most one every
+    'interval' seconds, across all worker processes. 'next_slot' is a shared
+    Value holding the time.monotonic() time of the next free slot; every
+    request reserves it under its lock and sleeps only until that slot, so the
+    other crawl tasks keep fetching and parsing in the meantime.
+    """
+
+    def __init__(self, next_slot, interval):
+        self.next_slot = next_slot
+        self.interval = interval
+
+    async def wait(self):
+        with self.next_slot.get_lock():
+            now = time.monotonic()
+            slot = max(now, self.next_slot.value)
+            self.next_slot.value = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+def init_session():
+    """
+    Creates the worker's pooled aiohttp session. Connections to the crawled
+    host are kept alive and shared by all of the worker's concurrent fetches.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, ttl_dns_cache=DNS_CACHE_TTL),
+        timeout=aiohttp.ClientTimeout(total=PAGE_LOAD_TIMEOUT),
+        headers={"User-Agent": USER_AGENT}
+    )
+
+# -----------------------------------------------------------------
+
+# -------------------- Seen-URL Filter --------------------
+
+class SharedBloomFilter:
+    """
+    Bloom filter over a shared memory bit array, marking URLs as seen across
+    all worker processes. It takes ~29 bits per URL at a 1e-6 false-positive
+    rate, where a shared dict keeps every URL string. A false positive only
+    means a page is never enqueued.
+
+    Each process also keeps an exact LRU of the URLs it recently added. Most
+    links on a page (menus, footers) repeat on every page, and the LRU
+    answers those without hashing or taking the shared lock.
+    """
+
+    def __init__(self, capacity, error_rate, recent_size=RECENT_SEEN_SIZE):
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.shm = shared_memory.SharedMemory(create=True, size=(self.num_bits + 7) // 8)
+        self.lock = Lock()
+        # Per process: each worker process gets its own copy
+        self.recent = OrderedDict()
+        self.recent_size = recent_size
+
+    def _positions(self, item):
+        # Double hashing: k bit positions derived from one 128-bit digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, item):
+        buf = self.shm.buf
+        return all(buf[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def add(self, item):
+        """
+        Marks the item as seen. Returns True if it wasn't seen before.
+        """
+        if item in self.recent:
+            self.recent.move_to_end(item)
+            return False
+        self.recent[item] = None
+        if len(self.recent) > self.recent_size:
+            self.recent.popitem(last=False)
+
+        positions = self._positions(item)
+        buf = self.shm.buf
+        added = False
+        with self.lock:  # Test-and-set, so two workers can't both claim a URL
+            for pos in positions:
+                mask = 1 << (pos & 7)
+                if not buf[pos >> 3] & mask:
+                    buf[pos >> 3] |= mask
+                    added = True
+        return added
+
+    def add_new(self, items):
+        """
+        Marks a set of items as seen. Returns the ones that weren't seen before.
+        """
+        # One set difference drops everything this process added recently
+        return [item for item in items - self.recent.keys() if self.add(item)]
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+# -----------------------------------------------------------------
+
+# -------------------- Content Hashes --------------------
+
+def load_content_hashes():
+    """
+    Loads the page text hashes recorded by previous crawls, if any.
+    """
+    try:
+        with open(CONTENT_HASHES_FILE, encoding="UTF-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def save_worker_content_hashes(hashes):
+    """
+    Saves the hashes of the pages a worker crawled, for main() to merge.
+    """
+    with open(f"{CONTENT_HASHES_FILE}.{os.getpid()}", "w", encoding="UTF-8") as f:
+        json.dump(hashes, f)
+
+def merge_content_hashes(hashes):
+    """
+    Merges the workers' hashes into the content hash file, and removes the worker files.
+    """
+    for path in glob.glob(f"{CONTENT_HASHES_FILE}.[0-9]*"):
+        with open(path, encoding="UTF-8") as f:
+            hashes.update(json.load(f))
+        os.remove(path)
+
+    # Write to a temporary file first, so an interrupted save can't corrupt the hashes
+    tmp_path = f"{CONTENT_HASHES_FILE}.tmp"
+    with open(tmp_path, "w", encoding="UTF-8") as f:
+        json.dump(hashes, f)
+    os.replace(tmp_path, CONTENT_HASHES_FILE)
+
+# -----------------------------------------------------------------
+
+# -------------------- Page Extraction --------------------
+
+class PageExtractor:
+    """
+    lxml parser target that collects a page's visible text and link targets
+    while the page is parsed, in a single pass: no document tree is built,
+    and nothing is walked afterwards. Script, style and template contents
+    are left out of the text. Parsing returns (text, hyperlinks), with the
+    text's whitespace collapsed to single spaces.
+    """
+
+    SKIPPED_TAGS = frozenset(("script", "style", "template"))
+
+    def __init__(self):
+        self.text_nodes = []
+        self.hyperlinks = set()
+        self._chunks = []  # Pieces of the current text node, which lxml may deliver in parts
+        self._skip_depth = 0
+
+    def _end_text_node(self):
+        if self._chunks:
+            self.text_nodes.append("".join(self._chunks))
+            self._chunks.clear()
+
+    def start(self, tag, attrib):
+        self._end_text_node()
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "a":
+            href = attrib.get("href")
+            if href is not None:
+                self.hyperlinks.add(href)
+
+    def end(self, tag):
+        self._end_text_node()
+        if tag in self.SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def data(self, data):
+        if not self._skip_depth:
+            self._chunks.append(data)
+
+    def comment(self, text):
+        self._end_text_node()
+
+    def close(self):
+        self._end_text_node()
+        text = " ".join(self.text_nodes)
+        return WHITESPACE_PATTERN.sub(" ", text).strip(), self.hyperlinks
+
+def page_parser(encoding=None):
+    """
+    Creates an incremental HTML parser that extracts a page with a fresh PageExtractor.
+    With no encoding, lxml takes it from the page's <meta charset>.
+    """
+    return etree.HTMLParser(target=PageExtractor(), encoding=encoding)
+
 # -----------------------------------------------------------------
 
 # -------------------- Utility Functions --------------------
 
+def fetched_page_parser(charset, head):
+    """
+    Creates the parser for a fetched page. It decodes with the charset of the
+    Content-Type header as sent ("euc-kr", ...), or else with Python's name
+    for it, for aliases lxml doesn't know ("latin-1" becomes "iso8859-1").
+    Without a charset lxml accepts, the encoding comes from the page's
+    <meta charset> if the start of the body declares one, and is UTF-8 otherwise.
+    """
+    if charset:
+        try:
+            return page_parser(charset)
+        except LookupError:
+            pass
+        try:
+            return page_parser(codecs.lookup(charset).name)
+        except LookupError:
+            pass
+    return page_parser(None if META_CHARSET_PATTERN.search(head) else "utf-8")
+
 def sanitize_filename(url):
     """
-    Converts a URL into a filesystem-friendly filename by removing protocols,
-    replacing special characters, and removing the hash for readability.
+    Converts a URL into a filesystem-friendly filename: a readable prefix
+    (protocol, query and fragment removed, special characters replaced),
+    followed by a BLAKE2b digest of the full URL. The digest keeps URLs that
+    differ only in their query, or in the characters that get replaced, from
+    overwriting each other, and the prefix is capped to stay within NAME_MAX.
     """
     url = url.rstrip('/')  # Remove trailing slash
     # Remove the protocol (http:// or https://)
-    url_no_protocol = re.sub(r'^http[s]?://', '', url)
+    url_no_protocol = url.partition("://")[2]
     # Remove query parameters and fragments
     url_no_protocol = url_no_protocol.split('?')[0].split('#')[0]
     # Replace all non-word characters with underscores
-    safe_url = re.sub(r'[^\w\-_\. ]', '_', url_no_protocol)
-    return safe_url
+    safe_url = UNSAFE_FILENAME_CHARS.sub('_', url_no_protocol[:FILENAME_PREFIX_LENGTH])
+    digest = hashlib.blake2b(url.encode("utf-8"), digest_size=8).hexdigest()
+    return f"{safe_url}_{digest}"
+
+async def fetch_page(session, url):
+    """
+    Fetches a page over the pooled HTTP session and extracts its text and
+    hyperlinks as it downloads: each body chunk is fed to an incremental
+    parser, so parsing overlaps the transfer and the raw body is never buffered.
+    Returns None for responses that aren't HTML (without reading the body),
+    and for pages that are empty or larger than MAX_PAGE_BYTES.
+    """
+    async with session.get(url) as response:
+        response.raise_for_status()
+        if response.content_type not in HTML_CONTENT_TYPES:
+            return None
+        if (response.content_length or 0) > MAX_PAGE_BYTES:
+            return None
+
+        parser = None
+        received = 0
+        async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+            received += len(chunk)
+            if received > MAX_PAGE_BYTES:
+                return None
+            if parser is None:
+                parser = fetched_page_parser(response.charset, chunk)
+            parser.feed(chunk)
+        if parser is None:
+            # Empty body: lxml can't close a parser that was never fed
+            return None
+        return parser.close()
+
+def render_html(driver, url):
+    """
+    Renders a page with Selenium and returns the resulting HTML.
+    Only needed for pages whose content is generated by JavaScript.
+    """
+    driver.get(url)
+
+    # Wait until the <body> tag is present, indicating the page has loaded
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.TAG_NAME, "body"))
+    )
+
+    # Get the rendered HTML straight from the page's JavaScript runtime over CDP,
+    # instead of ChromeDriver's page_source serialization
+    result = driver.execute_cdp_cmd(
+        "Runtime.evaluate",
+        {"expression": "document.documentElement.outerHTML", "returnByValue": True}
+    )
+    return result["result"]["value"]
+
+def extract_page(html):
+    """
+    Extracts the text and hyperlinks of a page's HTML (as rendered by Selenium).
+    The HTML is fed as UTF-8 bytes, since lxml rejects str input that carries
+    an encoding declaration.
+    """
+    parser = page_parser("utf-8")
+    parser.feed(html.encode("utf-8"))
+    return parser.close()
+
+def save_page(text_filepath, csv_filename, url, text):
+    """
+    Saves a page's text to its .txt file and its URL and text to its CSV.
+    Runs on a worker thread, so disk writes don't stall the event loop.
+    """
+    with open(text_filepath, "w", encoding="UTF-8") as f:
+        f.write(text)
+    write_csv(csv_filename, url, text)
 
-def extract_hyperlinks(soup):
+def write_csv(csv_filename, url, text):
     """
-    Extracts all unique hyperlinks from the BeautifulSoup-parsed HTML.
+    Writes a page's URL and text as a single-row CSV with a header.
     """
-    hyperlinks = set()
-    for a_tag in soup.find_all('a', href=True):
-        href = a_tag['href']
-        hyperlinks.add(href)
-    return hyperlinks
+    with open(csv_filename, "w", encoding="UTF-8", newline="") as f:
+        writer = csv.writer(f, escapechar='\\', lineterminator="\n")
+        writer.writerow(('fname', 'text'))
+        writer.writerow((url, text))
 
-def get_domain_hyperlinks(local_domain, hyperlinks):
+def get_domain_hyperlinks(hyperlinks):
     """
-    Filters and cleans hyperlinks to include only those within the same domain.
+    Filters and cleans hyperlinks to include only those within LOCAL_DOMAIN.
+    Returns them as a set.
     """
     clean_links = set()
     for link in hyperlinks:
         clean_link = None
 
         # If the link is an absolute URL, check if it's within the same domain
-        if re.match(HTTP_URL_PATTERN, link):
-            url_obj = urlparse(link)
-            if url_obj.netloc == local_domain:
-                clean_link = link
-        else:
+        if link.startswith(DOMAIN_URL_PREFIXES) or link in DOMAIN_ROOT_URLS:
+            clean_link = link
+        elif not link.startswith(HTTP_URL_PREFIXES):
             # Handle relative URLs
-            if link.startswith("/"):
-                clean_link = f"https://{local_domain}{link}"
-            elif not (link.startswith("#") or link.startswith("mailto:") or link.startswith("tel:")):
+            if link[:1] == "/":
+                clean_link = ROOT_URL + link
+            elif not link.startswith(SKIPPED_LINK_PREFIXES):
                 # Other relative links without leading slash
-                clean_link = f"https://{local_domain}/{link}"
+                clean_link = f"{ROOT_URL}/{link}"
 
         if clean_link:
-            # Remove trailing slash for consistency
-            if clean_link.endswith("/"):
-                clean_link = clean_link[:-1]
-            clean_links.add(clean_link)
+            # Remove trailing slashes for consistency
+            clean_links.add(clean_link.rstrip("/"))
 
-    return list(clean_links)
+    return clean_links
 
 # --------------------------------------------------------------
 
 # -------------------- Crawling Function --------------------
 
-def crawl(url, driver, queue, seen, pages_processed, log_queue):
+async def crawl(url, session, renderer, rate_limiter, queue, seen, pages_processed, content_hashes):
     """
     Crawls the given URL, extracts text, saves data, and queues internal links.
-    Implements retry logic for robustness.
+    Pages are fetched over plain HTTP and only rendered with Selenium when they
+    require JavaScript. Implements retry logic for robustness.
     """
+    # The worker has already attached its QueueHandler to this logger
     logger = logging.getLogger(current_process().name)
-    logger.addHandler(QueueHandler(log_queue))
-    logger.setLevel(logging.INFO)
 
     logger.info(f"Crawling ({pages_processed.value + 1}): {url}")
     retries = 0
 
     while retries < MAX_RETRIES:
         try:
-            driver.get(url)
-
-            # Wait until the <body> tag is present, indicating the page has loaded
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-
-            # Get the rendered HTML
-            rendered_html = driver.page_source
+            # Respectful crawling delay
+            await rate_limiter.wait()
 
-            # Parse with BeautifulSoup
-            soup = BeautifulSoup(rendered_html, "html.parser")
+            # Fetch and parse the plain HTML with lxml
+            page = await fetch_page(session, url)
+            if page is None:
+                logger.info(f"Skipped (not HTML, empty, or larger than {MAX_PAGE_BYTES} bytes): {url}")
+                return
+            cleaned_text, hyperlinks = page
 
-            # Extract text content
-            text = soup.get_text(separator=" ", strip=True)
-            cleaned_text = " ".join(text.split())
+            # Fall back to a full browser render for JavaScript-only pages
+            if JS_REQUIRED_MARKER in cleaned_text:
+                logger.info(f"Rendering with Selenium (JavaScript required): {url}")
+                cleaned_text, hyperlinks = extract_page(await renderer.render(url))
 
             # Check for JavaScript requirement message
-            if "You need to enable JavaScript to run this app." in cleaned_text:
+            if JS_REQUIRED_MARKER in cleaned_text:
                 logger.warning(f"Skipped (JavaScript required): {url}")
                 return
 
             # Sanitize filename
             file_identifier = sanitize_filename(url)
-
-            # Save text to file
             text_filepath = os.path.join(TEXT_DIR, f"{file_identifier}.txt")
-            with open(text_filepath, "w", encoding="UTF-8") as f:
-                f.write(cleaned_text)
-            logger.info(f"Saved Text: {text_filepath}")
-
-            # Save URL and text to CSV
-            df = pd.DataFrame([[url, cleaned_text]], columns=['fname', 'text'])
             csv_filename = os.path.join(CSV_DIR, f"{file_identifier}.csv")
-            df.to_csv(csv_filename, escapechar='\\', index=False)
-            logger.info(f"Saved CSV: {csv_filename}")
+
+            # Skip rewriting the files when the text hasn't changed since the last crawl
+            content_hash = hashlib.sha256(cleaned_text.encode("utf-8")).hexdigest()
+            unchanged = (content_hashes.get(url) == content_hash
+                         and os.path.exists(text_filepath) and os.path.exists(csv_filename))
+            # Also skip pages whose text was already saved this crawl under another URL
+            # (trailing slash or query variants); the seen filter keeps content keys next to URLs
+            content_key = f"content:{content_hash}"
+            if unchanged:
+                logger.info(f"Unchanged since last crawl: {url}")
+                seen.add(content_key)
+            elif content_key in seen:
+                logger.info(f"Skipped saving (same text as an already saved page): {url}")
+            else:
+                # Save text to file, and URL and text to CSV (one file per page, ingested as its own document)
+                await asyncio.to_thread(save_page, text_filepath, csv_filename, url, cleaned_text)
+                logger.info(f"Saved Text: {text_filepath}")
+                logger.info(f"Saved CSV: {csv_filename}")
+                # Only marked once saved, so a failed save doesn't keep the text from being saved
+                # under another URL; two workers racing on the same text just write it twice
+                seen.add(content_key)
+            content_hashes[url] = content_hash
 
             # Increment pages_processed
-            pages_processed.value += 1
-            logger.info(f"Pages Processed: {pages_processed.value}")
+            with pages_processed.get_lock():
+                pages_processed.value += 1
+                processed = pages_processed.value
+            logger.info(f"Pages Processed: {processed}")
 
-            # Extract and process hyperlinks
-            hyperlinks = extract_hyperlinks(soup)
+            # Process hyperlinks
             logger.info(f"Extracted {len(hyperlinks)} hyperlinks from {url}")
 
-            domain_links = get_domain_hyperlinks(LOCAL_DOMAIN, hyperlinks)
+            domain_links = get_domain_hyperlinks(hyperlinks)
             logger.info(f"Filtered {len(domain_links)} domain-specific links from {url}")
 
-            new_links = 0
-            for link in domain_links:
-                if link not in seen:
-                    queue.put(link)
-                    seen[link] = True  # Mark as seen when enqueuing
-                    new_links += 1
-                    logger.info(f"Enqueued new link: {link}")
+            new_links = seen.add_new(domain_links)  # Mark as seen when enqueuing
+            if logger.isEnabledFor(logging.DEBUG):
+                for link in new_links:
+                    logger.debug(f"Enqueued new link: {link}")
 
-            logger.info(f"Total new links enqueued from {url}: {new_links}")
+            # Hand the new links to the workers in batches, one queue message per batch
+            for i in range(0, len(new_links), URL_BATCH_SIZE):
+                queue.put(new_links[i:i + URL_BATCH_SIZE])
 
-            # Respectful crawling delay
-            time.sleep(CRAWL_DELAY)
+            logger.info(f"Total new links enqueued from {url}: {len(new_links)}")
             return  # Successfully processed
 
-        except TimeoutException:
+        except aiohttp.ClientResponseError as e:
+            # Client errors (404, 403, ...) won't go away on retry
+            if e.status < 500:
+                logger.warning(f"Skipped (HTTP {e.status}): {url}")
+                return
+            retries += 1
+            logger.error(f"HTTP error on {url}: {e}. Retry {retries}/{MAX_RETRIES}")
+            await asyncio.sleep(RETRY_DELAY)
+        except aiohttp.ClientError as e:
+            retries += 1
+            logger.error(f"Request error on {url}: {e}. Retry {retries}/{MAX_RETRIES}")
+            await asyncio.sleep(RETRY_DELAY)
+        except (asyncio.TimeoutError, TimeoutException):
             retries += 1
             logger.warning(f"Timeout loading {url}. Retry {retries}/{MAX_RETRIES}")
-            time.sleep(RETRY_DELAY)
+            await asyncio.sleep(RETRY_DELAY)
         except WebDriverException as e:
             retries += 1
             logger.error(f"Selenium error on {url}: {e}. Retry {retries}/{MAX_RETRIES}")
-            time.sleep(RETRY_DELAY)
+            await asyncio.sleep(RETRY_DELAY)
         except Exception as e:
             logger.error(f"Unexpected error processing {url}: {e}. Skipping...")
             return  # Skip on unexpected errors
@@ -283,33 +697,31 @@ def crawl(url, driver, queue, seen, pages_processed, log_queue):
 
 # -------------------- Worker Process --------------------
 
-def worker(url_queue, seen, pages_processed, log_queue):
+async def crawl_task(session, renderer, rate_limiter, url_queue, pending, seen, pages_processed, content_hashes):
     """
-    Worker process that continuously crawls URLs from the queue.
+    Continuously crawls URLs from the shared queue. Each worker process runs
+    CONCURRENCY of these tasks, so its page fetches overlap instead of waiting
+    on one another. URLs arrive in batches, which the worker's tasks share
+    through the local 'pending' deque.
     """
-    # Set up logging for the worker
     logger = logging.getLogger(current_process().name)
-    logger.setLevel(logging.INFO)
-    queue_handler = QueueHandler(log_queue)
-    logger.addHandler(queue_handler)
-    logger.propagate = False  # Prevent logs from propagating to the root logger
-
-    # Initialize WebDriver
-    try:
-        driver = init_webdriver()
-    except Exception as e:
-        logger.error(f"WebDriver initialization failed: {e}")
-        return
 
     while True:
-        try:
-            url = url_queue.get(timeout=5)  # Wait up to 5 seconds for a URL
-        except Empty:
-            # Queue is empty for 5 seconds, assume crawling is done
-            break
-        except Exception as e:
-            logger.error(f"Error getting URL from queue: {e}")
-            break
+        if not pending:
+            try:
+                # Wait up to 5 seconds for a batch of URLs, without blocking the event loop
+                pending.extend(await asyncio.to_thread(url_queue.get, timeout=5))
+            except Empty:
+                if pending:
+                    continue  # Another task of this worker fetched a batch meanwhile
+                # Queue is empty for 5 seconds, assume crawling is done
+                break
+            except Exception as e:
+                logger.error(f"Error getting URLs from queue: {e}")
+                break
+            continue  # Another task may have drained the batch in the meantime
+
+        url = pending.popleft()
 
         if pages_processed.value >= MAX_PAGES:
             break
@@ -318,10 +730,45 @@ def worker(url_queue, seen, pages_processed, log_queue):
         # No duplicate enqueues should occur
 
         # Crawl the URL
-        crawl(url, driver, url_queue, seen, pages_processed, log_queue)
+        await crawl(url, session, renderer, rate_limiter, url_queue, seen, pages_processed, content_hashes)
 
-    # Clean up
-    driver.quit()
+async def crawl_concurrently(renderer, url_queue, seen, pages_processed, next_request, content_hashes):
+    """
+    Runs the worker's crawl tasks over a single pooled HTTP session and rate limiter.
+    """
+    pending = deque()
+    rate_limiter = RateLimiter(next_request, CRAWL_DELAY)
+    async with init_session() as session:
+        await asyncio.gather(*(
+            crawl_task(session, renderer, rate_limiter, url_queue, pending, seen, pages_processed, content_hashes)
+            for _ in range(CONCURRENCY)
+        ))
+
+def worker(url_queue, seen, pages_processed, next_request, log_queue, previous_hashes):
+    """
+    Worker process that continuously crawls URLs from the queue.
+    """
+    # Set up logging for the worker
+    logger = logging.getLogger(current_process().name)
+    logger.setLevel(logging.INFO)
+    queue_handler = QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    logger.propagate = False  # Prevent logs from propagating to the root logger
+
+    # WebDriver for JavaScript-only pages, started on first use
+    renderer = BrowserRenderer()
+
+    # Hashes of the pages this worker crawls go to the first map, previous crawls' are read through
+    content_hashes = ChainMap({}, previous_hashes)
+
+    try:
+        asyncio.run(crawl_concurrently(renderer, url_queue, seen, pages_processed, next_request, content_hashes))
+    finally:
+        # Clean up
+        renderer.close()
+        save_worker_content_hashes(content_hashes.maps[0])
+        # Don't block exit on links nobody will read anymore (crawl finished or MAX_PAGES reached)
+        url_queue.cancel_join_thread()
     logger.info("Worker exiting.")
 
 # --------------------------------------------------------------
@@ -329,33 +776,43 @@ def worker(url_queue, seen, pages_processed, log_queue):
 # -------------------- Main Execution --------------------
 
 def main():
-    # Create a Manager for shared data structures
-    manager = Manager()
-    url_queue = manager.Queue()
-    seen = manager.dict()
-    pages_processed = manager.Value('i', 0)
+    # Create the shared data structures
+    url_queue = Queue()
+    seen = SharedBloomFilter(SEEN_CAPACITY, SEEN_ERROR_RATE)
+    pages_processed = Value('i', 0)
+    # Time of the next request slot, shared so all workers together keep to one request per CRAWL_DELAY
+    next_request = Value('d', 0.0)
 
-    # Initialize logging queue
-    log_queue = manager.Queue()
+    # Initialize logging queue (a pipe, with no manager process in between)
+    log_queue = Queue(-1)
 
     # Set up logging listener
     listener = setup_logging(log_queue)
 
+    # Load the page hashes from previous crawls
+    content_hashes = load_content_hashes()
+
     # Initialize the queue with the start URL
-    url_queue.put(FULL_URL)
+    url_queue.put([FULL_URL])
     # Remove the following line to allow workers to process the start URL
-    # seen[FULL_URL] = True
+    # seen.add(FULL_URL)
 
     # Create worker processes
     workers = []
     for _ in range(MAX_WORKERS):
-        p = Process(target=worker, args=(url_queue, seen, pages_processed, log_queue))
+        p = Process(target=worker, args=(url_queue, seen, pages_processed, next_request, log_queue, content_hashes))
         p.start()
         workers.append(p)
 
     # Wait for all workers to finish
-    for p in workers:
-        p.join()
+    try:
+        for p in workers:
+            p.join()
+    finally:
+        seen.close()
+
+    # Record this crawl's page hashes for the next one
+    merge_content_hashes(content_hashes)
 
     # Stop the logging listener
     listener.stop()